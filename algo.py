@@ -3,6 +3,7 @@ import math
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
+from timeline import ACTIVE, STANDBY, SLEEPING, WAKING_UP, SHUTTING_DOWN
 
 # Default Algorithm
 class Algorithm:
@@ -12,6 +13,12 @@ class Algorithm:
         self.state = 0 # 0 = active, 1 = standby, 2 = sleeping
         self.wu_tr = 0 # wake-up time remaining (2->0)
         self.sd_tr = 0 # shut-down time remaining (1->2)
+        self.timeline = None # optional timeline.Timeline to record power/state into
+
+    # record that the drive spends the next duration milliseconds in state
+    def record(self, duration, state):
+        if self.timeline is not None:
+            self.timeline.spend(duration, state)
 
     # call shutdown on an idle interval
     # uses up entire interval
@@ -23,14 +30,17 @@ class Algorithm:
         self.sd_tr = self.device.T_sd
         if self.sd_tr >= interval: # T_sd covers entire interval
             energy += interval*self.device.P_sd
+            self.record(interval, SHUTTING_DOWN)
             self.sd_tr -= interval
             assert self.sd_tr >= 0
         else:
             energy += self.sd_tr*self.device.P_sd
+            self.record(self.sd_tr, SHUTTING_DOWN)
             interval -= self.sd_tr
             self.sd_tr = 0
             self.state = 2 # now in sleeping state
             energy += interval*self.device.sleeping_power
+            self.record(interval, SLEEPING)
         return energy
 
     # pass in an idle interval
@@ -47,11 +57,13 @@ class Algorithm:
             if self.wu_tr > interval:
                 energy += self.wu_tr * self.device.P_wu
                 wait += self.backlog*interval
+                self.record(interval, WAKING_UP)
                 self.wu_tr -= interval
                 interval = 0
             elif self.wu_tr > 0 and self.wu_tr <= interval: 
                 energy += self.wu_tr*self.device.P_wu
                 wait += self.backlog*self.wu_tr
+                self.record(self.wu_tr, WAKING_UP)
                 interval -= self.wu_tr
                 self.wu_tr = 0 # reset the wake up timer
                 self.backlog = 0 # reset the number of backlogged requests
@@ -59,11 +71,13 @@ class Algorithm:
             elif self.sd_tr > interval:
                 energy += self.sd_tr * self.device.P_sd
                 wait += self.backlog*interval
+                self.record(interval, SHUTTING_DOWN)
                 self.sd_tr -= interval
                 interval = 0
             elif self.sd_tr > 0 and self.sd_tr <= interval:
                 energy += self.sd_tr*self.device.P_sd
                 wait += self.backlog*self.sd_tr
+                self.record(self.sd_tr, SHUTTING_DOWN)
                 interval -= self.sd_tr
                 self.sd_tr = 0 # reset the shut down timer
                 self.state = 2 # sleeping state
@@ -93,12 +107,14 @@ class Algorithm:
             if self.wu_tr > interval:
                 energy += self.wu_tr * self.device.P_wu
                 wait += interval*(interval+1)/2 + self.backlog*interval
+                self.record(interval, WAKING_UP)
                 self.wu_tr -= interval
                 self.backlog += interval
                 interval = 0
             elif self.wu_tr > 0 and self.wu_tr <= interval:
                 energy += self.wu_tr*self.device.P_wu
                 wait += self.wu_tr*(self.wu_tr)/2 + self.backlog*self.wu_tr
+                self.record(self.wu_tr, WAKING_UP)
                 interval -= self.wu_tr
                 self.wu_tr = 0 # reset the wake up timer
                 self.backlog = 0 # reset the number of backlogged requests
@@ -106,18 +122,21 @@ class Algorithm:
             elif self.sd_tr > interval:
                 energy += self.sd_tr * self.device.P_sd
                 wait += interval*(interval+1)/2 + self.backlog*interval
+                self.record(interval, SHUTTING_DOWN)
                 self.sd_tr -= interval
                 self.backlog += interval
                 interval = 0
             elif self.sd_tr > 0 and self.sd_tr <= interval:
                 energy += self.sd_tr*self.device.P_sd
                 wait += self.sd_tr*(self.sd_tr)/2 + self.backlog*self.sd_tr
+                self.record(self.sd_tr, SHUTTING_DOWN)
                 interval -= self.sd_tr
                 self.sd_tr = 0 # reset the shut down timer
                 self.state = 2 # sleeping state
             elif self.state == 0: # active
                 energy += interval*self.device.active_power
                 wait += self.backlog
+                self.record(interval, ACTIVE)
                 interval = 0
                 self.backlog = 0
         return energy, wait
@@ -127,6 +146,7 @@ class Algorithm:
         assert self.state == 1
         assert self.backlog == 0
         # default behavior (no algorithm)
+        self.record(interval, STANDBY)
         return interval*self.device.standby_power
 
 
@@ -143,9 +163,11 @@ class Timeout(Algorithm):
         assert self.backlog == 0
         if interval >= self.gamma:
             energy = self.gamma*self.device.standby_power
+            self.record(self.gamma, STANDBY)
             interval -= self.gamma
             return energy + self.shutdown(interval)
         else:
+            self.record(interval, STANDBY)
             return interval*self.device.standby_power
 
 
@@ -162,6 +184,7 @@ class MarkovChain(Algorithm):
         assert self.state == 1
         assert self.backlog == 0
         energy = interval*self.device.standby_power
+        shut = False
         flag = 1 if interval >= self.device.alpha else 0
         if len(self.history) == self.chain_len:
             hash = sum(j<<i for i,j in enumerate(reversed(self.history)))
@@ -172,6 +195,7 @@ class MarkovChain(Algorithm):
                     p = p1/(p1+p0)
                     if p > .5: # we shutdown
                         energy = self.shutdown(interval)
+                        shut = True
                 if flag not in self.prs[hash]:
                     self.prs[hash][flag] = 0
             else:
@@ -181,6 +205,8 @@ class MarkovChain(Algorithm):
             self.history.pop(0)
         # append whether or not the current interval was good to shut down
         self.history.append(flag)
+        if not shut:
+            self.record(interval, STANDBY)
         return energy
 
 
@@ -205,8 +231,10 @@ class EMA(Algorithm):
                     energy += self.shutdown(remain)
                 else:
                     energy += remain*self.device.standby_power
+                    self.record(remain, STANDBY)
             else:
                 energy += remain*self.device.standby_power
+                self.record(remain, STANDBY)
         # update ema
         if self.iterations < self.sigma:
             self.average += interval
@@ -299,6 +327,7 @@ class Logreg(Algorithm):
         assert self.backlog == 0
         count = 0
         if self.always == 0:
+            self.record(interval, STANDBY)
             return interval*self.device.standby_power
         elif self.always == 1:
             return self.shutdown(interval)
@@ -332,6 +361,7 @@ class Logreg(Algorithm):
             prediction = self.model.predict(df_in)
             if prediction > 0.5: # shutdown
                 return self.shutdown(interval)
+        self.record(interval, STANDBY)
         return interval*self.device.standby_power
 
 
@@ -354,4 +384,5 @@ class L(Algorithm):
         assert self.backlog == 0
         if self.prev <= self.theta:
             return self.shutdown(interval)
+        self.record(interval, STANDBY)
         return interval*self.device.standby_power
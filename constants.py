@@ -1,3 +1,6 @@
 # module for constants
 ALGOS = ["Default", "Timeout", "Markov Chain", "EMA", "Logistic Regression", "L-Shape"]
-WORKLOADS = ["normal", "exponential", "long_short", "periodic"]
\ No newline at end of file
+WORKLOADS = ["normal", "exponential", "long_short", "periodic"]
+STATES = ["Active", "Standby", "Sleeping", "Waking Up", "Shutting Down"] # indexed by timeline state code
+# milliseconds per power/state timeline sample written by run.py, 0 disables timeline export
+TIMELINE_RESOLUTION = 0
\ No newline at end of file
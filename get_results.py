@@ -1,8 +1,10 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 import pickle
-from constants import ALGOS, WORKLOADS
+from constants import ALGOS, WORKLOADS, STATES
 import HDD
+import timeline
 
 def make_plot(statskey: str, ylabel: str, title:str):
     fig, ax = plt.subplots()
@@ -27,6 +29,25 @@ def make_plot(statskey: str, ylabel: str, title:str):
     return fig, lgd
 
 
+# plot power draw and drive state over [start, end) milliseconds of a timeline written by run.py
+# only the pyramid level with at most max_points samples in the span is read
+def make_timeline_plot(path: str, title: str, start: int = 0, end: int = None, max_points: int = 4000):
+    times, power, states = timeline.load(path, start, end, max_points)
+    hours = times/3600000
+    fig, (ax_power, ax_state) = plt.subplots(2, 1, sharex=True, figsize=(10, 6), gridspec_kw={"height_ratios": [2, 1]})
+    ax_power.fill_between(hours, power[:, 0], power[:, 2], step="post", alpha=0.3, label="Min/Max")
+    ax_power.step(hours, power[:, 1], where="post", linewidth=0.8, label="Mean")
+    ax_power.set_ylabel("Power (Watts)")
+    ax_power.set_title(title)
+    ax_power.legend(loc='upper right')
+    ax_state.stackplot(hours, states.T, labels=STATES, step="post")
+    ax_state.set_xlabel("Time (hours)")
+    ax_state.set_ylabel("Fraction of time")
+    ax_state.set_ylim(0, 1)
+    lgd = ax_state.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    return fig, lgd
+
+
 with open("./results/results.pickle", "rb") as f:
     R = pickle.load(f)
     for drive in HDD.DRIVES:
@@ -42,3 +63,13 @@ with open("./results/results.pickle", "rb") as f:
         fig, lgd = make_plot("Wait", "Milliseconds per request", "Average Wait Time Per Request " + drive.name)
         fig.savefig("./results/" + drive.name + "/" + "wait.pdf", bbox_extra_artists=(lgd,), bbox_inches='tight')
         plt.close(fig)
+
+        # get timeline plots for any timelines exported by run.py
+        for workload_name in WORKLOADS:
+            for algo_name in ALGOS:
+                path = timeline.timeline_path(drive.name, workload_name, algo_name)
+                if not os.path.isfile(os.path.join(path, "meta.pickle")):
+                    continue
+                fig, lgd = make_timeline_plot(path, "Power Timeline " + drive.name + " " + workload_name + " " + algo_name)
+                fig.savefig(path + "/" + "timeline.pdf", bbox_extra_artists=(lgd,), bbox_inches='tight')
+                plt.close(fig)
@@ -1,10 +1,14 @@
 import pandas as pd
 import pickle
 import algo
-from constants import WORKLOADS
+from constants import ALGOS, WORKLOADS, TIMELINE_RESOLUTION
 import HDD
+from timeline import Timeline, timeline_path
 
-def run(A: algo.Algorithm, W: list):
+# if timeline is a directory, the power/state timeline is written there with resolution milliseconds per sample
+def run(A: algo.Algorithm, W: list, timeline: str = None, resolution: int = 1):
+    if timeline is not None:
+        A.timeline = Timeline(timeline, A.device, sum(abs(i) for i in W), resolution)
     total_consumption = 0
     total_wait_time = 0
     request_count = 0
@@ -18,6 +22,9 @@ def run(A: algo.Algorithm, W: list):
             request_count += i
         total_consumption += energy_consumption
         total_wait_time += wait_time
+    if A.timeline is not None:
+        A.timeline.close()
+        A.timeline = None
     return total_consumption/3600, total_wait_time/(1000*request_count)
 
 
@@ -32,44 +39,51 @@ def test_workload(drive_name: str, hd: HDD, workload_name: str, ):
                 "Wait": [] # Average wait time per request (s/request)
             }
 
+            # run an algorithm, exporting its timeline if enabled in constants
+            def simulate(A: algo.Algorithm, W: list):
+                timeline = None
+                if TIMELINE_RESOLUTION > 0:
+                    timeline = timeline_path(drive_name, workload_name[:-len(".pickle")], ALGOS[len(stats["Energy"])])
+                return run(A, W, timeline, TIMELINE_RESOLUTION)
+
             # following ordering in algo.ALGOS
-            e, w = run(algo.Algorithm(hd), W)
+            e, w = simulate(algo.Algorithm(hd), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
 
             if drive_name == "HDD_A":
-                e,w = run(algo.Timeout(hd, 0), W)
+                e,w = simulate(algo.Timeout(hd, 0), W)
             elif drive_name == "HDD_B":
-                e,w = run(algo.Timeout(hd, 0), W)
+                e,w = simulate(algo.Timeout(hd, 0), W)
             else:
-                e,w = run(algo.Timeout(hd, 0), W)
+                e,w = simulate(algo.Timeout(hd, 0), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
 
             
-            e,w = run(algo.MarkovChain(hd, 4), W)
+            e,w = simulate(algo.MarkovChain(hd, 4), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
 
             if drive_name == "HDD_A":
-                e,w = run(algo.EMA(hd, 5), W)
+                e,w = simulate(algo.EMA(hd, 5), W)
             elif drive_name == "HDD_B":
-                e,w = run(algo.EMA(hd, 3), W)
+                e,w = simulate(algo.EMA(hd, 3), W)
             else:
-                e,w = run(algo.EMA(hd, 2), W)
+                e,w = simulate(algo.EMA(hd, 2), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
 
-            e,w = run(algo.Logreg(hd, W, 10), W)
+            e,w = simulate(algo.Logreg(hd, W, 10), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
 
             if drive_name == "HDD_A":
-                e,w = run(algo.L(hd, 11000), W)
+                e,w = simulate(algo.L(hd, 11000), W)
             elif drive_name == "HDD_B":
-                e,w = run(algo.L(hd, 30000), W)
+                e,w = simulate(algo.L(hd, 30000), W)
             else:
-                e,w = run(algo.L(hd, 130000), W)
+                e,w = simulate(algo.L(hd, 130000), W)
             stats["Energy"].append(e)
             stats["Wait"].append(w)
             return pd.DataFrame(stats)
@@ -0,0 +1,148 @@
+import os
+import pickle
+import numpy as np
+import HDD
+
+# timeline state codes, 0-2 match Algorithm.state
+ACTIVE = 0
+STANDBY = 1
+SLEEPING = 2
+WAKING_UP = 3
+SHUTTING_DOWN = 4
+NUM_STATES = 5
+
+CHUNK = 1 << 20 # samples read at a time when building the first pyramid level
+
+
+# directory holding the timeline of an algorithm run on a workload
+def timeline_path(drive_name: str, workload_name: str, algo_name: str):
+    return "./results/" + drive_name + "/timelines/" + workload_name + "/" + algo_name.replace(" ", "_")
+
+
+# Power/state timeline of one simulation, written to memory-mapped .npy files
+# power.npy holds the mean power draw (Watts) of every sample
+# state.npy holds the state code the drive is in at the end of every sample
+# power_<k>.npy holds (min, mean, max) power over factor^k samples
+# state_<k>.npy holds the number of samples spent in each state over factor^k samples
+class Timeline:
+    # length is the total simulated time in milliseconds
+    # resolution is the number of milliseconds per sample
+    # factor is the downsampling factor between pyramid levels
+    def __init__(self, path: str, device: HDD, length: int, resolution: int = 1, factor: int = 16):
+        assert resolution >= 1 and factor >= 2
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.resolution = resolution
+        self.factor = factor
+        self.t = 0 # milliseconds recorded so far
+        self.last = ACTIVE # state of the last recorded segment
+        self.n = max(1, -(-length // resolution)) # number of samples
+        # power draw of each state in Watts
+        self.power_of = [device.active_power*1000, device.standby_power*1000,
+                         device.sleeping_power*1000, device.P_wu*1000, device.P_sd*1000]
+        # power accumulates Watt-milliseconds per sample until close()
+        self.power = np.lib.format.open_memmap(os.path.join(path, "power.npy"), mode="w+", dtype=np.float32, shape=(self.n,))
+        self.state = np.lib.format.open_memmap(os.path.join(path, "state.npy"), mode="w+", dtype=np.uint8, shape=(self.n,))
+
+    # drive spends the next duration milliseconds in state
+    def spend(self, duration, state):
+        if duration <= 0:
+            return
+        r = self.resolution
+        p = self.power_of[state]
+        start = self.t
+        end = start + duration
+        self.t = end
+        self.last = state
+        if r == 1:
+            self.power[start:end] = p
+            self.state[start:end] = state
+            return
+        first = start // r
+        last = (end - 1) // r
+        if first == last: # segment within a single sample
+            self.power[first] += p*duration
+        else:
+            self.power[first] += p*((first+1)*r - start)
+            self.power[first+1:last] += p*r
+            self.power[last] += p*(end - last*r)
+        # samples whose last millisecond falls inside the segment
+        self.state[start//r:end//r] = state
+
+    # finalize samples and build the min/mean/max pyramid
+    def close(self):
+        if self.resolution > 1:
+            for i in range(0, self.n, CHUNK):
+                self.power[i:i+CHUNK] /= self.resolution
+            # partial last sample only covers the remaining milliseconds
+            tail = self.t - (self.n-1)*self.resolution
+            if 0 < tail < self.resolution:
+                self.power[-1] *= self.resolution/tail
+                self.state[-1] = self.last
+        self.power.flush()
+        self.state.flush()
+
+        f = self.factor
+        # first level is read from the memory map in chunks
+        step = CHUNK // f * f
+        lo, total, hi, count, occupancy = [], [], [], [], []
+        for i in range(0, self.n, step):
+            p = np.asarray(self.power[i:i+step], dtype=np.float64)
+            s = np.asarray(self.state[i:i+step])
+            idx = np.arange(0, len(p), f)
+            lo.append(np.minimum.reduceat(p, idx))
+            hi.append(np.maximum.reduceat(p, idx))
+            total.append(np.add.reduceat(p, idx))
+            count.append(np.diff(np.append(idx, len(p))))
+            occupancy.append(np.add.reduceat(s[:, None] == np.arange(NUM_STATES), idx).astype(np.uint32))
+        lo, total, hi = np.concatenate(lo), np.concatenate(total), np.concatenate(hi)
+        count, occupancy = np.concatenate(count), np.concatenate(occupancy)
+        del self.power, self.state
+
+        # remaining levels fit in memory
+        levels = 0
+        while True:
+            levels += 1
+            np.save(os.path.join(self.path, "power_%d.npy" % levels),
+                    np.stack([lo, total/count, hi], axis=1).astype(np.float32))
+            np.save(os.path.join(self.path, "state_%d.npy" % levels), occupancy)
+            if len(lo) <= f:
+                break
+            idx = np.arange(0, len(lo), f)
+            lo = np.minimum.reduceat(lo, idx)
+            hi = np.maximum.reduceat(hi, idx)
+            total = np.add.reduceat(total, idx)
+            count = np.add.reduceat(count, idx)
+            occupancy = np.add.reduceat(occupancy, idx, axis=0)
+
+        with open(os.path.join(self.path, "meta.pickle"), "wb") as fp:
+            pickle.dump({"length": self.t, "resolution": self.resolution,
+                         "factor": f, "levels": levels}, fp)
+
+
+# read the span [start, end) milliseconds of a timeline at the finest level with at most max_points samples
+# returns (times in ms, power as (min, mean, max) columns, state occupancy as fractions per state)
+def load(path: str, start: int = 0, end: int = None, max_points: int = 4000):
+    with open(os.path.join(path, "meta.pickle"), "rb") as fp:
+        meta = pickle.load(fp)
+    if end is None or end > meta["length"]:
+        end = meta["length"]
+    start = max(0, start)
+    assert start < end
+    r, f = meta["resolution"], meta["factor"]
+    level = 0
+    while level < meta["levels"] and (end - start)/(r * f**level) > max_points:
+        level += 1
+    width = r * f**level # milliseconds per sample at this level
+    a, b = start // width, -(-end // width)
+    if level == 0:
+        p = np.array(np.load(os.path.join(path, "power.npy"), mmap_mode="r")[a:b], dtype=np.float32)
+        s = np.array(np.load(os.path.join(path, "state.npy"), mmap_mode="r")[a:b])
+        power = np.stack([p, p, p], axis=1)
+        states = (s[:, None] == np.arange(NUM_STATES)).astype(np.float32)
+    else:
+        power = np.array(np.load(os.path.join(path, "power_%d.npy" % level), mmap_mode="r")[a:b])
+        occupancy = np.array(np.load(os.path.join(path, "state_%d.npy" % level), mmap_mode="r")[a:b], dtype=np.float32)
+        states = occupancy/occupancy.sum(axis=1, keepdims=True)
+    times = np.arange(a, a + len(power)) * width
+    return times, power, states